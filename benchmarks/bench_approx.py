@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark generate_summary --approx against the exact summary.
+
+Builds a synthetic sessions directory under a temporary HOME, runs the exact
+summary once, then the approximate one at several sample rates and seeds,
+reporting speedup, relative error and how often the 95% interval covered
+the exact value. The speedup baseline is the exact summary without time
+tracking, which --approx does not compute.
+"""
+
+import json
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate_summary import generate_summary, generate_summary_approx  # noqa: E402
+
+
+TOOLS = ['exec', 'read', 'write', 'edit', 'browser.open', 'web_search', 'memory.get', 'cron']
+
+
+def make_sessions(sessions_dir, count, days, seed):
+    """Write synthetic sessions with skewed sizes and tool usage."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    sessions_dir.mkdir(parents=True)
+    for i in range(count):
+        ts = now - timedelta(days=rng.uniform(0, days))
+        lines = [{'type': 'session', 'id': f"bench-{i}", 'timestamp': ts.isoformat()}]
+        for _ in range(int(rng.lognormvariate(2.5, 1.0))):
+            ts += timedelta(seconds=rng.expovariate(1 / 300))
+            role = rng.choice(['user', 'assistant'])
+            content = [{'type': 'text', 'text': 'x' * rng.randint(20, 400)}]
+            if role == 'assistant' and rng.random() < 0.5:
+                tool = TOOLS[min(int(rng.expovariate(0.6)), len(TOOLS) - 1)]
+                content.append({'type': 'toolCall', 'name': tool})
+            lines.append({
+                'type': 'message',
+                'timestamp': ts.isoformat(),
+                'message': {
+                    'role': role,
+                    'content': content,
+                    'usage': {'cost': {'total': rng.uniform(0, 0.02)}}
+                }
+            })
+        with open(sessions_dir / f"bench-{i:06d}.jsonl", 'w') as f:
+            for line in lines:
+                f.write(json.dumps(line) + '\n')
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark approximate summaries")
+    parser.add_argument("--sessions", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seeds", type=int, default=5, help="Approx runs per configuration")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['HOME'] = home
+        make_sessions(Path(home) / ".openclaw" / "agents" / "main" / "sessions",
+                      args.sessions, args.days, seed=0)
+        date_args = ('week', 0, '2000-01-01', '2100-01-01')
+
+        _, tracked_time = timed(generate_summary, *date_args)
+        exact, exact_time = timed(generate_summary, *date_args, idle_gap=None)
+        print(f"exact: {exact['sessions']} sessions, {exact['messages']} messages, "
+              f"${exact['cost']:.2f}, {len(exact['all_tools'])} tools in {exact_time:.2f}s "
+              f"({tracked_time:.2f}s with time tracking)")
+        print()
+        print("session_rate message_rate  speedup  msg_err  cost_err  msg_cover  cost_cover"
+              "  tools_in_sample")
+
+        for session_rate, message_rate in [(0.05, 1.0), (0.1, 1.0), (0.1, 0.5),
+                                           (0.2, 1.0), (0.2, 0.25), (0.5, 1.0),
+                                           (1.0, 0.25)]:
+            runtime = msg_err = cost_err = msg_cover = cost_cover = 0
+            tools = set()
+            for seed in range(args.seeds):
+                approx, elapsed = timed(generate_summary_approx, *date_args,
+                                        sample_rate=session_rate,
+                                        message_rate=message_rate, seed=seed)
+                ci = approx['confidence_intervals']
+                runtime += elapsed
+                msg_err += abs(approx['messages'] - exact['messages']) / exact['messages']
+                cost_err += abs(approx['cost'] - exact['cost']) / exact['cost']
+                msg_cover += ci['messages'][0] <= exact['messages'] <= ci['messages'][1]
+                cost_cover += ci['cost'][0] <= exact['cost'] <= ci['cost'][1]
+                tools.add(approx['distinct_tools_in_sample'])
+            n = args.seeds
+            print(f"{session_rate:12.2f} {message_rate:12.2f} {exact_time / (runtime / n):7.1f}x "
+                  f"{msg_err / n:7.1%} {cost_err / n:9.1%} {msg_cover / n:10.0%} "
+                  f"{cost_cover / n:11.0%}  {sorted(tools)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,22 @@ Generate work summaries from session logs for any time period.
 
 import json
 import argparse
+import math
+import random
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
 import sys
 
+from sketches import CountMinSketch, HyperLogLog
+from time_tracking import (DEFAULT_IDLE_GAP, finish_tracking, parse_timestamp,
+                           parse_utc_timestamp, start_tracking, track_message)
+
+# z-score of the reported confidence intervals (95%)
+CONFIDENCE_Z = 1.96
+
+# Minimum sessions sampled per date stratum, so its variance can be estimated
+MIN_STRATUM_SAMPLE = 2
+
 
 def get_agent_id():
     """Get current agent ID from environment or default."""
@@ -22,9 +33,24 @@ def get_sessions_dir():
     return home / ".openclaw" / "agents" / get_agent_id() / "sessions"
 
 
-def parse_timestamp(ts_str):
-    """Parse ISO timestamp string."""
-    return datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+def period_start(ts, period):
+    """Get the start of the day/week/month containing ts."""
+    start = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'week':
+        start -= timedelta(days=start.weekday())
+    elif period == 'month':
+        start = start.replace(day=1)
+    return start
+
+
+def shift_period(start, period, n):
+    """Move a period start n periods forward (negative n moves back)."""
+    if period == 'day':
+        return start + timedelta(days=n)
+    if period == 'week':
+        return start + timedelta(weeks=n)
+    month = start.year * 12 + start.month - 1 + n
+    return start.replace(year=month // 12, month=month % 12 + 1)
 
 
 def get_session_files(sessions_dir, start_date, end_date):
@@ -35,22 +61,20 @@ def get_session_files(sessions_dir, start_date, end_date):
             continue
         try:
             # Get first message timestamp
-            result = subprocess.run(
-                ['head', '-1', str(jsonl_file)],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout)
+            with open(jsonl_file, 'r') as f:
+                first_line = f.readline()
+            if first_line.strip():
+                data = json.loads(first_line)
                 ts = parse_timestamp(data['timestamp'])
                 if start_date <= ts <= end_date:
                     files.append((jsonl_file, ts))
-        except (json.JSONDecodeError, KeyError, ValueError):
+        except (json.JSONDecodeError, KeyError, ValueError, OSError):
             continue
     return sorted(files, key=lambda x: x[1])
 
 
-def analyze_session(jsonl_file):
-    """Analyze a single session file."""
+def analyze_session(jsonl_file, idle_gap=DEFAULT_IDLE_GAP):
+    """Analyze a single session file (idle_gap=None skips time tracking)."""
     stats = {
         'messages': 0,
         'user_messages': 0,
@@ -59,6 +83,7 @@ def analyze_session(jsonl_file):
         'tools_used': set(),
         'topics': []
     }
+    tracker = start_tracking(idle_gap) if idle_gap is not None else None
     
     try:
         with open(jsonl_file, 'r') as f:
@@ -82,33 +107,106 @@ def analyze_session(jsonl_file):
                         stats['cost'] += cost
                     
                     # Tools
+                    tools = []
                     content = data.get('message', {}).get('content', [])
                     for item in content:
                         if item.get('type') == 'toolCall':
-                            stats['tools_used'].add(item.get('name', '').split('.')[0])
+                            tools.append(item.get('name', '').split('.')[0])
                         elif item.get('type') == 'text' and role == 'user':
                             text = item.get('text', '')
                             # Simple topic extraction from first 100 chars
                             if len(stats['topics']) < 5 and len(text) > 20:
                                 stats['topics'].append(text[:100])
+                    stats['tools_used'].update(tools)
+                    
+                    # Active time
+                    if tracker is not None and data.get('timestamp'):
+                        track_message(tracker, parse_utc_timestamp(data['timestamp']), tools)
                                 
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, ValueError):
                     continue
     except Exception as e:
         print(f"Error reading {jsonl_file}: {e}", file=sys.stderr)
     
     stats['tools_used'] = list(stats['tools_used'])
+    stats['active_seconds'] = finish_tracking(tracker)['active_seconds'] if tracker else 0
     return stats
 
 
-def generate_summary(period='week', offset=0, from_date=None, to_date=None):
-    """Generate work summary."""
-    sessions_dir = get_sessions_dir()
+def analyze_session_by_period(jsonl_file, period, session_start, buckets,
+                              idle_gap=DEFAULT_IDLE_GAP):
+    """Analyze a session, bucketing each message into its period.
+
+    Only periods whose start is in ``buckets`` are kept. Messages without a
+    timestamp inherit the previous one (or the session start).
+    """
+    periods = {}
+    ts = session_start
+    tracker = start_tracking(idle_gap)
     
-    if not sessions_dir.exists():
-        return {"error": f"Sessions directory not found: {sessions_dir}"}
+    try:
+        with open(jsonl_file, 'r') as f:
+            for line in f:
+                try:
+                    data = json.loads(line.strip())
+                    if data.get('type') != 'message':
+                        continue
+                    
+                    message = data.get('message', {})
+                    tools = [
+                        item.get('name', '').split('.')[0]
+                        for item in message.get('content', [])
+                        if item.get('type') == 'toolCall'
+                    ]
+                    if data.get('timestamp'):
+                        utc_ts = parse_utc_timestamp(data['timestamp'])
+                        track_message(tracker, utc_ts, tools)
+                        ts = utc_ts.astimezone().replace(tzinfo=None)
+                    key = period_start(ts, period)
+                    if key not in buckets:
+                        continue
+                    
+                    stats = periods.get(key)
+                    if stats is None:
+                        stats = periods[key] = {
+                            'messages': 0,
+                            'user_messages': 0,
+                            'assistant_messages': 0,
+                            'cost': 0,
+                            'active_seconds': 0,
+                            'tools_used': set()
+                        }
+                    
+                    stats['messages'] += 1
+                    role = message.get('role', '')
+                    
+                    if role == 'user':
+                        stats['user_messages'] += 1
+                    elif role == 'assistant':
+                        stats['assistant_messages'] += 1
+                    
+                    cost = message.get('usage', {}).get('cost', {}).get('total', 0)
+                    if cost:
+                        stats['cost'] += cost
+                    
+                    stats['tools_used'].update(tools)
+                                
+                except (json.JSONDecodeError, ValueError):
+                    continue
+    except Exception as e:
+        print(f"Error reading {jsonl_file}: {e}", file=sys.stderr)
+    
+    # Active time is split per day, which nests inside every period
+    for day, seconds in finish_tracking(tracker)['by_day'].items():
+        key = period_start(datetime.fromisoformat(day), period)
+        if key in periods:
+            periods[key]['active_seconds'] += seconds
     
-    # Calculate date range
+    return periods
+
+
+def get_date_range(period='week', offset=0, from_date=None, to_date=None):
+    """Get (start, end) datetimes for a period, or None if unknown."""
     now = datetime.now()
     
     if from_date and to_date:
@@ -132,7 +230,23 @@ def generate_summary(period='week', offset=0, from_date=None, to_date=None):
         else:
             end_date = start_date.replace(month=start_date.month + 1) - timedelta(seconds=1)
     else:
+        return None
+    
+    return start_date, end_date
+
+
+def generate_summary(period='week', offset=0, from_date=None, to_date=None,
+                     idle_gap=DEFAULT_IDLE_GAP):
+    """Generate work summary."""
+    sessions_dir = get_sessions_dir()
+    
+    if not sessions_dir.exists():
+        return {"error": f"Sessions directory not found: {sessions_dir}"}
+    
+    date_range = get_date_range(period, offset, from_date, to_date)
+    if date_range is None:
         return {"error": f"Unknown period: {period}"}
+    start_date, end_date = date_range
     
     # Get sessions
     session_files = get_session_files(sessions_dir, start_date, end_date)
@@ -151,40 +265,405 @@ def generate_summary(period='week', offset=0, from_date=None, to_date=None):
         'user_messages': 0,
         'assistant_messages': 0,
         'cost': 0,
+        'active_seconds': 0,
         'all_tools': set(),
         'topics': []
     }
     
     for jsonl_file, _ in session_files:
-        stats = analyze_session(jsonl_file)
+        stats = analyze_session(jsonl_file, idle_gap)
         total_stats['messages'] += stats['messages']
         total_stats['user_messages'] += stats['user_messages']
         total_stats['assistant_messages'] += stats['assistant_messages']
         total_stats['cost'] += stats['cost']
+        total_stats['active_seconds'] += stats['active_seconds']
         total_stats['all_tools'].update(stats['tools_used'])
         total_stats['topics'].extend(stats['topics'])
     
     total_stats['all_tools'] = list(total_stats['all_tools'])
+    active_seconds = total_stats.pop('active_seconds')
+    if idle_gap is not None:
+        total_stats['time_tracked_hours'] = round(active_seconds / 3600, 2)
     total_stats['date_range'] = f"{start_date.date()} to {end_date.date()}"
     total_stats['period'] = period
     
     return total_stats
 
 
+def generate_trend(period='week', last=12, offset=0, idle_gap=DEFAULT_IDLE_GAP):
+    """Generate per-period stats for the last N periods in a single scan."""
+    sessions_dir = get_sessions_dir()
+    
+    if not sessions_dir.exists():
+        return {"error": f"Sessions directory not found: {sessions_dir}"}
+    if period not in ('day', 'week', 'month'):
+        return {"error": f"Unknown period: {period}"}
+    if last < 1:
+        return {"error": "--last must be at least 1"}
+    
+    current = shift_period(period_start(datetime.now(), period), period, -offset)
+    starts = [shift_period(current, period, -n) for n in range(last - 1, -1, -1)]
+    start_date = starts[0]
+    end_date = shift_period(current, period, 1) - timedelta(microseconds=1)
+    
+    buckets = {
+        start: {
+            'sessions': 0,
+            'messages': 0,
+            'user_messages': 0,
+            'assistant_messages': 0,
+            'cost': 0,
+            'active_seconds': 0,
+            'tools': set()
+        }
+        for start in starts
+    }
+    
+    # One pass over every session in the whole window
+    session_files = get_session_files(sessions_dir, start_date, end_date)
+    for jsonl_file, session_start in session_files:
+        periods = analyze_session_by_period(jsonl_file, period, session_start, buckets,
+                                            idle_gap)
+        for key, stats in periods.items():
+            bucket = buckets[key]
+            bucket['sessions'] += 1
+            bucket['messages'] += stats['messages']
+            bucket['user_messages'] += stats['user_messages']
+            bucket['assistant_messages'] += stats['assistant_messages']
+            bucket['cost'] += stats['cost']
+            bucket['active_seconds'] += stats['active_seconds']
+            bucket['tools'].update(stats['tools_used'])
+    
+    trend = []
+    previous = None
+    for start in starts:
+        bucket = buckets[start]
+        end = shift_period(start, period, 1) - timedelta(seconds=1)
+        entry = {
+            'period_start': start.date().isoformat(),
+            'date_range': f"{start.date()} to {end.date()}",
+            'sessions': bucket['sessions'],
+            'messages': bucket['messages'],
+            'user_messages': bucket['user_messages'],
+            'assistant_messages': bucket['assistant_messages'],
+            'cost': round(bucket['cost'], 4),
+            'time_tracked_hours': round(bucket['active_seconds'] / 3600, 2),
+            'tools': sorted(bucket['tools']),
+            'delta': None
+        }
+        if previous is not None:
+            entry['delta'] = {
+                'sessions': entry['sessions'] - previous['sessions'],
+                'messages': entry['messages'] - previous['messages'],
+                'cost': round(entry['cost'] - previous['cost'], 4),
+                'time_tracked_hours': round(
+                    entry['time_tracked_hours'] - previous['time_tracked_hours'], 2),
+                'new_tools': sorted(bucket['tools'] - set(previous['tools'])),
+                'dropped_tools': sorted(set(previous['tools']) - bucket['tools'])
+            }
+        trend.append(entry)
+        previous = entry
+    
+    return {
+        'period': period,
+        'last': last,
+        'date_range': f"{start_date.date()} to {end_date.date()}",
+        'sessions_scanned': len(session_files),
+        'trend': trend
+    }
+
+
+def sample_session(jsonl_file, message_rate, rng, weight, tools_hll, tools_cms):
+    """Analyze a Bernoulli sample of a session's lines.
+
+    Counts are scaled by 1/message_rate so they estimate the whole session,
+    and 'variance' holds the unbiased estimate of each one's line-sampling
+    variance; 'tools' and 'tool_variance' hold the same per tool. Tool calls
+    also go into the sketches with the session's sampling weight.
+    """
+    metrics = ('messages', 'user_messages', 'assistant_messages', 'cost', 'tool_calls')
+    sampled = dict.fromkeys(metrics, 0)
+    sampled['lines_parsed'] = 0
+    # Sums of squared per-line values; counts of 0/1 indicators are their own
+    cost_squares = 0
+    tool_call_squares = 0
+    tools = {}
+    tool_squares = {}
+    
+    try:
+        with open(jsonl_file, 'r') as f:
+            for line in f:
+                # Skip before parsing: JSON decoding is the expensive part
+                if message_rate < 1 and rng.random() >= message_rate:
+                    continue
+                try:
+                    sampled['lines_parsed'] += 1
+                    data = json.loads(line)
+                    if data.get('type') != 'message':
+                        continue
+                    
+                    sampled['messages'] += 1
+                    message = data.get('message', {})
+                    role = message.get('role', '')
+                    
+                    if role == 'user':
+                        sampled['user_messages'] += 1
+                    elif role == 'assistant':
+                        sampled['assistant_messages'] += 1
+                    
+                    cost = message.get('usage', {}).get('cost', {}).get('total', 0)
+                    if cost:
+                        sampled['cost'] += cost
+                        cost_squares += cost * cost
+                    
+                    calls = {}
+                    for item in message.get('content', []):
+                        if item.get('type') == 'toolCall':
+                            tool = item.get('name', '').split('.')[0]
+                            calls[tool] = calls.get(tool, 0) + 1
+                            tools_hll.add(tool)
+                            tools_cms.add(tool, weight / message_rate)
+                    if calls:
+                        tool_calls = sum(calls.values())
+                        sampled['tool_calls'] += tool_calls
+                        tool_call_squares += tool_calls * tool_calls
+                        for tool, count in calls.items():
+                            tools[tool] = tools.get(tool, 0) + count
+                            tool_squares[tool] = tool_squares.get(tool, 0) + count * count
+                except json.JSONDecodeError:
+                    continue
+    except Exception as e:
+        print(f"Error reading {jsonl_file}: {e}", file=sys.stderr)
+    
+    # Var(sum x/m) = (1-m)/m * sum x^2, estimated from kept lines as (1-m)/m^2 * sum x^2
+    scale = (1 - message_rate) / message_rate ** 2
+    squares = dict(sampled, cost=cost_squares, tool_calls=tool_call_squares)
+    sampled['variance'] = {metric: scale * squares[metric] for metric in metrics}
+    sampled['tool_variance'] = {tool: scale * sq for tool, sq in tool_squares.items()}
+    sampled['tools'] = {tool: count / message_rate for tool, count in tools.items()}
+    for metric in metrics:
+        sampled[metric] /= message_rate
+    return sampled
+
+
+def stratum_total(size, values, line_variances):
+    """Estimate a stratum total and its two-stage variance.
+
+    values are the estimated totals of the n sessions sampled out of size,
+    line_variances their line-sampling variances.
+    """
+    n = len(values)
+    mean = sum(values) / n
+    variance = size / n * sum(line_variances)
+    if n > 1:
+        s2 = sum((v - mean) ** 2 for v in values) / (n - 1)
+        variance += size * size * (1 - n / size) * s2 / n
+    return size * mean, variance
+
+
+def date_strata(session_files, sample_rate):
+    """Group date-sorted sessions into strata of consecutive days.
+
+    Days are merged until a stratum expects MIN_STRATUM_SAMPLE sampled
+    sessions, so sparse histories still get a variance estimate.
+    """
+    target = MIN_STRATUM_SAMPLE / sample_rate
+    strata = []
+    current = []
+    for i, (jsonl_file, ts) in enumerate(session_files):
+        current.append(jsonl_file)
+        next_day = session_files[i + 1][1].date() if i + 1 < len(session_files) else None
+        if next_day != ts.date() and len(current) >= target:
+            strata.append(current)
+            current = []
+    if current:
+        if strata:
+            strata[-1].extend(current)
+        else:
+            strata.append(current)
+    return strata
+
+
+def generate_summary_approx(period='week', offset=0, from_date=None, to_date=None,
+                            sample_rate=0.1, message_rate=1.0, seed=None):
+    """Estimate a work summary from a stratified sample of sessions.
+
+    Sessions are stratified by start date and sampled without replacement
+    within each stratum; lines of sampled sessions are sampled at
+    message_rate. Totals use the stratified estimator with a 95% interval
+    from the two-stage variance: between sessions (with the finite
+    population correction) plus the line-sampling variance within each
+    sampled session.
+    """
+    sessions_dir = get_sessions_dir()
+    
+    if not sessions_dir.exists():
+        return {"error": f"Sessions directory not found: {sessions_dir}"}
+    if not 0 < sample_rate <= 1 or not 0 < message_rate <= 1:
+        return {"error": "Sample rates must be in (0, 1]"}
+    
+    date_range = get_date_range(period, offset, from_date, to_date)
+    if date_range is None:
+        return {"error": f"Unknown period: {period}"}
+    start_date, end_date = date_range
+    
+    # Reading first lines is cheap and gives the exact session count
+    session_files = get_session_files(sessions_dir, start_date, end_date)
+    
+    if not session_files:
+        return {
+            "period": period,
+            "date_range": f"{start_date.date()} to {end_date.date()}",
+            "message": "No sessions found in this period"
+        }
+    
+    rng = random.Random(seed)
+    tools_hll = HyperLogLog()
+    tools_cms = CountMinSketch()
+    metrics = ('messages', 'user_messages', 'assistant_messages', 'cost', 'tool_calls')
+    totals = dict.fromkeys(metrics, 0.0)
+    variances = dict.fromkeys(metrics, 0.0)
+    strata = date_strata(session_files, sample_rate)
+    # Per-tool counts of each sampled session, kept for the heavy hitters' intervals
+    stratum_tools = []
+    sampled_sessions = 0
+    lines_parsed = 0
+    
+    def interval(total, variance):
+        margin = CONFIDENCE_Z * math.sqrt(variance)
+        return [max(0, total - margin), total + margin]
+    
+    for stratum in strata:
+        size = len(stratum)
+        n = min(size, max(MIN_STRATUM_SAMPLE, round(size * sample_rate)))
+        weight = size / n
+        samples = [
+            sample_session(jsonl_file, message_rate, rng, weight, tools_hll, tools_cms)
+            for jsonl_file in rng.sample(stratum, n)
+        ]
+        sampled_sessions += n
+        lines_parsed += sum(sample['lines_parsed'] for sample in samples)
+        stratum_tools.append((size, [(s['tools'], s['tool_variance']) for s in samples]))
+        
+        for metric in metrics:
+            total, variance = stratum_total(size, [s[metric] for s in samples],
+                                            [s['variance'][metric] for s in samples])
+            totals[metric] += total
+            variances[metric] += variance
+    
+    intervals = {metric: interval(totals[metric], variances[metric]) for metric in metrics}
+    
+    # The sketch only picks the heavy hitters; their counts get the same
+    # stratified estimate as tool_calls, since sampling error dominates
+    top_tools = []
+    for tool, _ in tools_cms.most_common():
+        total = variance = 0.0
+        for size, samples in stratum_tools:
+            t, v = stratum_total(size, [counts.get(tool, 0) for counts, _ in samples],
+                                 [line_vars.get(tool, 0) for _, line_vars in samples])
+            total += t
+            variance += v
+        top_tools.append((tool, total, interval(total, variance)))
+    top_tools.sort(key=lambda x: -x[1])
+    
+    def rounded(metric, value):
+        return round(value, 4) if metric == 'cost' else round(value)
+    
+    return {
+        'approx': True,
+        'period': period,
+        'date_range': f"{start_date.date()} to {end_date.date()}",
+        'sessions': len(session_files),
+        'messages': rounded('messages', totals['messages']),
+        'user_messages': rounded('user_messages', totals['user_messages']),
+        'assistant_messages': rounded('assistant_messages', totals['assistant_messages']),
+        'cost': rounded('cost', totals['cost']),
+        'tool_calls': rounded('tool_calls', totals['tool_calls']),
+        'confidence_intervals': {
+            metric: [rounded(metric, lo), rounded(metric, hi)]
+            for metric, (lo, hi) in intervals.items()
+        },
+        'confidence': 0.95,
+        'top_tools': [
+            {'tool': tool, 'calls': round(calls), 'interval': [round(lo), round(hi)]}
+            for tool, calls, (lo, hi) in top_tools
+        ],
+        # HyperLogLog over the sampled lines: a lower bound for the full history
+        'distinct_tools_in_sample': round(tools_hll.count()),
+        'distinct_tools_in_sample_error': round(tools_hll.relative_error, 4),
+        'sample': {
+            'sessions_sampled': sampled_sessions,
+            'sessions_total': len(session_files),
+            'strata': len(strata),
+            'session_rate': sample_rate,
+            'message_rate': message_rate,
+            'lines_parsed': lines_parsed
+        }
+    }
+
+
+def print_trend_markdown(trend):
+    """Print a trend report as a Markdown table."""
+    print(f"# Work Trend ({trend.get('date_range', 'Unknown')})")
+    print()
+    if 'error' in trend:
+        print(f"Error: {trend['error']}")
+        return
+    
+    print("| Period | Sessions | Messages | Cost | Hours | Tools | Δ Messages | Δ Cost |")
+    print("|--------|----------|----------|------|-------|-------|------------|--------|")
+    for entry in trend['trend']:
+        delta = entry['delta']
+        d_messages = f"{delta['messages']:+d}" if delta else "-"
+        d_cost = f"{delta['cost']:+.4f}" if delta else "-"
+        print(f"| {entry['period_start']} | {entry['sessions']} | {entry['messages']} "
+              f"| ${entry['cost']:.4f} | {entry['time_tracked_hours']} "
+              f"| {len(entry['tools'])} | {d_messages} | {d_cost} |")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate work summaries")
     parser.add_argument("--period", choices=['day', 'week', 'month'], default='week',
                        help="Time period for summary")
     parser.add_argument("--offset", type=int, default=0,
                        help="Periods ago (0=current, 1=previous)")
+    parser.add_argument("--last", type=int,
+                       help="Trend mode: report each of the last N periods")
     parser.add_argument("--from", dest='from_date', help="Start date (YYYY-MM-DD)")
     parser.add_argument("--to", dest='to_date', help="End date (YYYY-MM-DD)")
+    parser.add_argument("--idle-gap", type=float, default=DEFAULT_IDLE_GAP,
+                       help="Minutes without messages that end a block of tracked time")
+    parser.add_argument("--approx", action='store_true',
+                       help="Estimate totals from a stratified sample of sessions")
+    parser.add_argument("--sample-rate", type=float, default=0.1,
+                       help="Fraction of sessions sampled per date stratum (--approx)")
+    parser.add_argument("--message-rate", type=float, default=1.0,
+                       help="Fraction of lines parsed in sampled sessions (--approx)")
+    parser.add_argument("--seed", type=int, help="Random seed for --approx sampling")
     parser.add_argument("--format", choices=['json', 'markdown'], default='json',
                        help="Output format")
     
     args = parser.parse_args()
     
-    summary = generate_summary(args.period, args.offset, args.from_date, args.to_date)
+    if args.last is not None:
+        if args.from_date or args.to_date:
+            parser.error("--last cannot be combined with --from/--to")
+        if args.approx:
+            parser.error("--last cannot be combined with --approx")
+        trend = generate_trend(args.period, args.last, args.offset, args.idle_gap)
+        if args.format == 'markdown':
+            print_trend_markdown(trend)
+        else:
+            print(json.dumps(trend, indent=2))
+        sys.exit(1 if 'error' in trend else 0)
+    
+    if args.approx:
+        summary = generate_summary_approx(args.period, args.offset, args.from_date,
+                                          args.to_date, args.sample_rate,
+                                          args.message_rate, args.seed)
+    else:
+        summary = generate_summary(args.period, args.offset, args.from_date, args.to_date,
+                                   args.idle_gap)
     
     if args.format == 'markdown':
         print(f"# Work Summary ({summary.get('date_range', 'Unknown')})")
@@ -193,6 +672,29 @@ if __name__ == "__main__":
             print(f"Error: {summary['error']}")
         elif 'message' in summary:
             print(summary['message'])
+        elif summary.get('approx'):
+            ci = summary['confidence_intervals']
+            sample = summary['sample']
+            print(f"## Overview (estimated, 95% intervals)")
+            print(f"- Sessions: {summary['sessions']} "
+                  f"({sample['sessions_sampled']} sampled in {sample['strata']} date strata)")
+            print(f"- Total Messages: ~{summary['messages']} "
+                  f"({ci['messages'][0]}-{ci['messages'][1]})")
+            print(f"- Your Messages: ~{summary['user_messages']} "
+                  f"({ci['user_messages'][0]}-{ci['user_messages'][1]})")
+            print(f"- Assistant Messages: ~{summary['assistant_messages']} "
+                  f"({ci['assistant_messages'][0]}-{ci['assistant_messages'][1]})")
+            print(f"- Total Cost: ~${summary['cost']:.4f} "
+                  f"(${ci['cost'][0]:.4f}-${ci['cost'][1]:.4f})")
+            print(f"- Distinct Tools (in sample): ~{summary['distinct_tools_in_sample']} "
+                  f"(±{summary['distinct_tools_in_sample_error']:.1%})")
+            print()
+            if summary['top_tools']:
+                print(f"## Top Tools (estimated calls, 95% intervals)")
+                for entry in summary['top_tools']:
+                    print(f"- {entry['tool']}: ~{entry['calls']} calls "
+                          f"({entry['interval'][0]}-{entry['interval'][1]})")
+                print()
         else:
             print(f"## Overview")
             print(f"- Sessions: {summary['sessions']}")
@@ -200,6 +702,7 @@ if __name__ == "__main__":
             print(f"- Your Messages: {summary['user_messages']}")
             print(f"- Assistant Messages: {summary['assistant_messages']}")
             print(f"- Total Cost: ${summary['cost']:.4f}")
+            print(f"- Time Tracked: {summary['time_tracked_hours']} hours")
             print()
             if summary['all_tools']:
                 print(f"## Tools Used")
@@ -208,3 +711,4 @@ if __name__ == "__main__":
                 print()
     else:
         print(json.dumps(summary, indent=2))
+    sys.exit(1 if 'error' in summary else 0)
@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+Regex search across sessions, narrowed by a trigram index.
+
+Every message's text is indexed by its lowercase trigrams. A regex is
+turned into a boolean query over trigrams that any match must contain
+(the Google Code Search approach); only the messages that satisfy that
+query are read back from disk and checked with the real regex.
+"""
+
+import json
+import re
+import argparse
+import sqlite3
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+from operator import sub
+from pathlib import Path
+import sys
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+INDEX_VERSION = 3
+
+# Posting blobs hold unsigned 32-bit message id deltas
+ID_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+# Messages indexed before pending postings are written out as a batch
+FLUSH_MESSAGES = 20000
+
+# Posting batches, or deleted messages relative to live ones, that trigger
+# compaction
+COMPACT_BATCHES = 8
+COMPACT_DEAD_RATIO = 0.25
+
+# Ids per "IN (...)" query, below SQLite's bound-parameter limit
+SQL_BATCH = 500
+
+# Largest set of exact strings tracked for a regex fragment before it is
+# turned into a trigram query
+MAX_EXACT = 16
+
+# Largest character class expanded into exact strings
+MAX_CLASS = 8
+
+ANY = ('all',)
+
+# ASCII letters re matches case-insensitively against non-ASCII letters
+IGNORECASE_UNSAFE = frozenset('iks')
+
+
+def get_sessions_dir():
+    """Get the sessions directory path."""
+    return Path.home() / ".openclaw" / "agents" / "main" / "sessions"
+
+
+def get_index_file():
+    """Get the search index file."""
+    config_dir = Path.home() / ".config" / "session-intelligence"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir / "search_index.sqlite3"
+
+
+def parse_timestamp(ts_str):
+    """Parse ISO timestamp string as a naive local datetime."""
+    ts = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone().replace(tzinfo=None)
+    return ts
+
+
+def message_text(data):
+    """Get the searchable text of a message record."""
+    content = data.get('message', {}).get('content', [])
+    if isinstance(content, str):
+        return content
+    parts = []
+    for item in content:
+        if isinstance(item, dict) and isinstance(item.get('text'), str):
+            parts.append(item['text'])
+    return '\n'.join(parts)
+
+
+def trigrams(text):
+    """Get the set of trigrams in an (already lowercased) string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# --- Index ------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT INTO meta VALUES ('batches', 0), ('dead_messages', 0);
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    offset INTEGER NOT NULL,
+    last_timestamp TEXT
+);
+CREATE TABLE messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX messages_session ON messages (session, timestamp);
+CREATE INDEX messages_timestamp ON messages (timestamp);
+CREATE TABLE postings (
+    trigram TEXT NOT NULL,
+    batch INTEGER NOT NULL,
+    ids BLOB NOT NULL,
+    PRIMARY KEY (trigram, batch)
+) WITHOUT ROWID;
+"""
+
+
+def open_index(rebuild=False):
+    """Open the index database, creating it if missing or outdated."""
+    index_file = get_index_file()
+    if rebuild and index_file.exists():
+        index_file.unlink()
+
+    conn = sqlite3.connect(index_file)
+    if conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+        conn.close()
+        index_file.unlink()
+        conn = sqlite3.connect(index_file)
+        # Must be set before the first table exists
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.executescript(SCHEMA)
+        conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+        conn.commit()
+    return conn
+
+
+def get_meta(conn, key):
+    return conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()[0]
+
+
+def set_meta(conn, key, value):
+    conn.execute('UPDATE meta SET value = ? WHERE key = ?', (value, key))
+
+
+def encode_ids(ids):
+    """Pack ascending message ids as zlib-compressed 32-bit deltas."""
+    deltas = array(ID_TYPECODE, ids[:1])
+    deltas.extend(map(sub, ids[1:], ids[:-1]))
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def decode_ids(blob):
+    """Unpack a posting blob into ascending message ids."""
+    deltas = array(ID_TYPECODE)
+    deltas.frombytes(zlib.decompress(blob))
+    return accumulate(deltas)
+
+
+def drop_session(conn, session_id):
+    """Delete a session and its messages.
+
+    Their ids stay in the postings until compaction; they no longer resolve
+    to a message, so searches skip them.
+    """
+    dead = conn.execute('DELETE FROM messages WHERE session = ?', (session_id,)).rowcount
+    conn.execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+    set_meta(conn, 'dead_messages', get_meta(conn, 'dead_messages') + dead)
+
+
+def flush_postings(conn, postings):
+    """Write pending postings as a new batch and clear them."""
+    if not postings:
+        return
+    batch = get_meta(conn, 'batches')
+    conn.executemany(
+        'INSERT INTO postings (trigram, batch, ids) VALUES (?, ?, ?)',
+        ((tri, batch, encode_ids(ids)) for tri, ids in postings.items())
+    )
+    set_meta(conn, 'batches', batch + 1)
+    postings.clear()
+
+
+def compact_index(conn):
+    """Merge all posting batches into one and drop ids of deleted messages."""
+    live = {row[0] for row in conn.execute('SELECT id FROM messages')}
+    conn.execute('CREATE TEMP TABLE compacted (trigram TEXT PRIMARY KEY, ids BLOB)')
+
+    def merged():
+        trigram, ids = None, []
+        for tri, blob in conn.execute('SELECT trigram, ids FROM postings ORDER BY trigram, batch'):
+            if tri != trigram:
+                if ids:
+                    yield trigram, encode_ids(ids)
+                trigram, ids = tri, []
+            ids.extend(i for i in decode_ids(blob) if i in live)
+        if ids:
+            yield trigram, encode_ids(ids)
+
+    conn.executemany('INSERT INTO compacted VALUES (?, ?)', list(merged()))
+    conn.execute('DELETE FROM postings')
+    conn.execute('INSERT INTO postings SELECT trigram, 0, ids FROM compacted')
+    conn.execute('DROP TABLE compacted')
+    set_meta(conn, 'batches', 1)
+    set_meta(conn, 'dead_messages', 0)
+
+
+def index_session(conn, jsonl_file, session_id, offset, last_ts, postings):
+    """Index the complete lines of a session file from a byte offset.
+
+    Trigram postings are added to the pending postings dict. Returns the
+    new offset, the last timestamp seen and the number of messages added.
+    """
+    added = 0
+
+    with open(jsonl_file, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                # Line still being written; pick it up next time
+                break
+            line_offset = offset
+            offset += len(raw)
+            try:
+                data = json.loads(raw)
+                if data.get('timestamp'):
+                    last_ts = parse_timestamp(data['timestamp']).isoformat()
+                if data.get('type') != 'message':
+                    continue
+                text = message_text(data)
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError, AttributeError):
+                continue
+            if not text:
+                continue
+
+            msg_id = conn.execute(
+                'INSERT INTO messages (session, offset, timestamp) VALUES (?, ?, ?)',
+                (session_id, line_offset, last_ts)
+            ).lastrowid
+            for tri in trigrams(text.lower()):
+                try:
+                    postings[tri].append(msg_id)
+                except KeyError:
+                    postings[tri] = array(ID_TYPECODE, (msg_id,))
+            added += 1
+
+    return offset, last_ts, added
+
+
+def update_index(conn):
+    """Bring the index up to date with the sessions directory.
+
+    Session logs are append-only, so a file that only grew is indexed from
+    where the last run stopped; files that shrank are re-indexed and files
+    that disappeared are deleted. Each run's postings are written as a new
+    batch, and the index is compacted once there are COMPACT_BATCHES
+    batches or deleted messages exceed COMPACT_DEAD_RATIO of the live ones.
+    Nothing is written when no session changed. Returns the number of
+    messages added.
+    """
+    sessions_dir = get_sessions_dir()
+    known = {
+        row[1]: row for row in
+        conn.execute('SELECT id, name, size, mtime, offset, last_timestamp FROM sessions')
+    }
+    postings = {}
+    pending = 0
+    seen = set()
+    added = 0
+    changed = False
+
+    for jsonl_file in sessions_dir.glob("*.jsonl"):
+        if '.deleted.' in jsonl_file.name:
+            continue
+        name = jsonl_file.stem
+        seen.add(name)
+        try:
+            st = jsonl_file.stat()
+            record = known.get(name)
+            if record is not None:
+                session_id, _, size, mtime, offset, last_ts = record
+                if size == st.st_size and mtime == st.st_mtime:
+                    continue
+                if st.st_size < offset:
+                    drop_session(conn, session_id)
+                    record = None
+            if record is None:
+                session_id = conn.execute(
+                    'INSERT INTO sessions (name, size, mtime, offset) VALUES (?, 0, 0, 0)',
+                    (name,)
+                ).lastrowid
+                offset, last_ts = 0, None
+
+            offset, last_ts, count = index_session(
+                conn, jsonl_file, session_id, offset, last_ts, postings)
+            conn.execute(
+                'UPDATE sessions SET size = ?, mtime = ?, offset = ?, last_timestamp = ? '
+                'WHERE id = ?',
+                (st.st_size, st.st_mtime, offset, last_ts, session_id)
+            )
+            added += count
+            changed = True
+
+            # Bound memory on large first builds
+            pending += count
+            if pending >= FLUSH_MESSAGES:
+                flush_postings(conn, postings)
+                pending = 0
+        except Exception as e:
+            print(f"Error indexing {jsonl_file}: {e}", file=sys.stderr)
+
+    for name in set(known) - seen:
+        drop_session(conn, known[name][0])
+        changed = True
+
+    if not changed:
+        return 0
+
+    flush_postings(conn, postings)
+    live = conn.execute('SELECT count(*) FROM messages').fetchone()[0]
+    if (get_meta(conn, 'batches') >= COMPACT_BATCHES
+            or get_meta(conn, 'dead_messages') > live * COMPACT_DEAD_RATIO):
+        compact_index(conn)
+    conn.commit()
+    # Each result row is one freed page; step through all of them
+    conn.execute('PRAGMA incremental_vacuum').fetchall()
+    return added
+
+
+# --- Regex to trigram query -------------------------------------------------
+
+def and_query(queries):
+    """AND queries together, simplifying away ANY."""
+    parts = []
+    for q in queries:
+        if q[0] == 'and':
+            parts.extend(q[1])
+        elif q != ANY:
+            parts.append(q)
+    if not parts:
+        return ANY
+    if len(parts) == 1:
+        return parts[0]
+    return ('and', parts)
+
+
+def or_query(queries):
+    """OR queries together; ANY absorbs everything."""
+    parts = []
+    for q in queries:
+        if q == ANY:
+            return ANY
+        if q[0] == 'or':
+            parts.extend(q[1])
+        else:
+            parts.append(q)
+    if not parts:
+        return ANY
+    if len(parts) == 1:
+        return parts[0]
+    return ('or', parts)
+
+
+def strings_query(strings):
+    """Query requiring one of the strings to be present."""
+    alternatives = []
+    for s in strings:
+        if len(s) < 3:
+            return ANY
+        alternatives.append(and_query([('tri', t) for t in sorted(trigrams(s))]))
+    return or_query(alternatives)
+
+
+def info_query(info):
+    """Turn an (exact, query) pair into a plain query."""
+    exact, query = info
+    if exact is None:
+        return query
+    return strings_query(exact)
+
+
+def fold_char(code, ignore_case):
+    """Lowercase a literal for trigram matching, or None if unsafe.
+
+    Non-ASCII lowercasing can be context dependent, and with IGNORECASE
+    re also matches 'i', 'k' and 's' against non-ASCII letters (such as
+    U+0130 and U+017F) that str.lower() does not map back to them.
+    """
+    if code >= 128:
+        return None
+    char = chr(code).lower()
+    if ignore_case and char in IGNORECASE_UNSAFE:
+        return None
+    return char
+
+
+def analyze_literal(code, ignore_case):
+    """Exact info for a single literal character."""
+    char = fold_char(code, ignore_case)
+    if char is None:
+        return None, ANY
+    return {char}, ANY
+
+
+def analyze_class(items, ignore_case):
+    """Exact info for a small, non-negated character class."""
+    codes = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            codes.append(av)
+        elif op is sre_parse.RANGE:
+            lo, hi = av
+            if hi - lo >= MAX_CLASS:
+                return None, ANY
+            codes.extend(range(lo, hi + 1))
+        else:
+            return None, ANY
+
+    chars = set()
+    for code in codes:
+        char = fold_char(code, ignore_case)
+        if char is None:
+            return None, ANY
+        chars.add(char)
+    if not chars or len(chars) > MAX_CLASS:
+        return None, ANY
+    return chars, ANY
+
+
+def analyze_node(op, av, ignore_case):
+    """Analyze one parsed regex node into (exact strings or None, query)."""
+    if op is sre_parse.LITERAL:
+        return analyze_literal(av, ignore_case)
+    if op is sre_parse.IN:
+        return analyze_class(av, ignore_case)
+    if op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        # Zero-width: matches the empty string
+        return {''}, ANY
+    if op is sre_parse.SUBPATTERN:
+        _, add_flags, del_flags, sub = av
+        if add_flags & re.IGNORECASE:
+            ignore_case = True
+        elif del_flags & re.IGNORECASE:
+            ignore_case = False
+        return analyze_sequence(sub, ignore_case)
+    if op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return analyze_sequence(av, ignore_case)
+    if op is sre_parse.BRANCH:
+        infos = [analyze_sequence(branch, ignore_case) for branch in av[1]]
+        if all(exact is not None for exact, _ in infos):
+            union = set().union(*(exact for exact, _ in infos))
+            if len(union) <= MAX_EXACT:
+                return union, ANY
+        return None, or_query([info_query(info) for info in infos])
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+              getattr(sre_parse, 'POSSESSIVE_REPEAT', None)):
+        low, high, sub = av
+        exact, query = analyze_sequence(sub, ignore_case)
+        if low == 0:
+            if high == 1 and exact is not None:
+                return exact | {''}, ANY
+            return None, ANY
+        if low == high == 1:
+            return exact, query
+        return None, info_query((exact, query))
+    return None, ANY
+
+
+def analyze_sequence(nodes, ignore_case=False):
+    """Analyze a concatenation of regex nodes."""
+    exact = {''}
+    is_exact = True
+    query = ANY
+
+    for op, av in nodes:
+        node_exact, node_query = analyze_node(op, av, ignore_case)
+        if node_exact is None:
+            query = and_query([query, strings_query(exact), node_query])
+            exact = {''}
+            is_exact = False
+        elif len(exact) * len(node_exact) <= MAX_EXACT:
+            exact = {a + b for a in exact for b in node_exact}
+        else:
+            query = and_query([query, strings_query(exact)])
+            exact = node_exact
+            is_exact = False
+
+    if is_exact:
+        return exact, ANY
+    return None, and_query([query, strings_query(exact)])
+
+
+def regex_query(pattern, flags=0):
+    """Get the trigram query every match of a regex must satisfy."""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return ANY
+    state = getattr(parsed, 'state', None) or getattr(parsed, 'pattern', None)
+    ignore_case = bool((flags | getattr(state, 'flags', 0)) & re.IGNORECASE)
+    return info_query(analyze_sequence(parsed, ignore_case))
+
+
+def fetch_posting(conn, trigram):
+    """Get the ids of messages containing a trigram."""
+    ids = set()
+    for (blob,) in conn.execute('SELECT ids FROM postings WHERE trigram = ?', (trigram,)):
+        ids.update(decode_ids(blob))
+    return ids
+
+
+def evaluate_query(query, conn):
+    """Evaluate a query to a set of message ids, or None for all messages."""
+    kind = query[0]
+    if kind == 'all':
+        return None
+    if kind == 'tri':
+        return fetch_posting(conn, query[1])
+    if kind == 'and':
+        results = [ids for ids in (evaluate_query(part, conn) for part in query[1])
+                   if ids is not None]
+        if not results:
+            return None
+        # Intersect smallest first
+        results.sort(key=len)
+        result = results[0]
+        for ids in results[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+    result = set()
+    for part in query[1]:
+        ids = evaluate_query(part, conn)
+        if ids is None:
+            return None
+        result |= ids
+    return result
+
+
+def fetch_messages(conn, ids, session=None, start=None, end=None):
+    """Yield (session id, offset, timestamp) of live messages among ids.
+
+    ids None means all messages. session restricts them to session names
+    with that prefix and start/end to timestamps in [start, end); both are
+    filtered in SQL so the message indexes are used.
+    """
+    sql = 'SELECT session, offset, timestamp FROM messages'
+    where, params = [], []
+    if session:
+        where.append('session IN (SELECT id FROM sessions WHERE substr(name, 1, ?) = ?)')
+        params += [len(session), session]
+    if start:
+        where.append('timestamp >= ?')
+        params.append(start)
+    if end:
+        where.append('timestamp < ?')
+        params.append(end)
+
+    if ids is None:
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        yield from conn.execute(sql, params)
+        return
+
+    ids = sorted(ids)
+    for i in range(0, len(ids), SQL_BATCH):
+        batch = ids[i:i + SQL_BATCH]
+        clauses = [f'id IN ({",".join("?" * len(batch))})'] + where
+        yield from conn.execute(sql + ' WHERE ' + ' AND '.join(clauses), batch + params)
+
+
+# --- Search -----------------------------------------------------------------
+
+def snippet(text, match, width=160):
+    """Get a one-line snippet around a match."""
+    start = max(0, match.start() - width // 4)
+    end = min(len(text), max(match.end(), start + width))
+    return ' '.join(text[start:end].split())
+
+
+def search_sessions(query, ignore_case=False, fixed=False, session=None,
+                    from_date=None, to_date=None, limit=50, rebuild=False):
+    """Search message text with a regex, using the trigram index."""
+    sessions_dir = get_sessions_dir()
+
+    if not sessions_dir.exists():
+        return {"error": f"Sessions directory not found: {sessions_dir}"}
+
+    pattern = re.escape(query) if fixed else query
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        regex = re.compile(pattern, flags)
+    except re.error as e:
+        return {"error": f"Invalid regex: {e}"}
+    if limit < 1:
+        return {"error": "--limit must be at least 1"}
+
+    # Indexed timestamps are naive local ISO strings, so dates compare as prefixes
+    try:
+        end = None
+        if to_date:
+            end = (datetime.fromisoformat(to_date) + timedelta(days=1)).date().isoformat()
+    except ValueError as e:
+        return {"error": f"Invalid date: {e}"}
+
+    conn = open_index(rebuild)
+    try:
+        added = update_index(conn)
+        names = dict(conn.execute('SELECT id, name FROM sessions'))
+        indexed = conn.execute('SELECT count(*) FROM messages').fetchone()[0]
+
+        # Narrow by session and date before reading any session file
+        ids = evaluate_query(regex_query(pattern, flags), conn)
+        messages = list(fetch_messages(conn, ids, session, from_date, end))
+    finally:
+        conn.close()
+
+    # Newest candidates first, so the limit keeps the most recent matches
+    messages.sort(key=lambda m: (m[2] or '', m[1]), reverse=True)
+
+    matches = []
+    unreadable = set()
+    # Sessions rarely overlap in time, so one open file at a time suffices
+    current, f = None, None
+    try:
+        for session_id, offset, ts in messages:
+            if len(matches) >= limit:
+                break
+            session_id = names[session_id]
+            if session_id in unreadable:
+                continue
+            if session_id != current:
+                if f is not None:
+                    f.close()
+                current, f = None, None
+                jsonl_file = sessions_dir / f"{session_id}.jsonl"
+                try:
+                    f = open(jsonl_file, 'rb')
+                except OSError as e:
+                    print(f"Error reading {jsonl_file}: {e}", file=sys.stderr)
+                    unreadable.add(session_id)
+                    continue
+                current = session_id
+            f.seek(offset)
+            try:
+                data = json.loads(f.readline())
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            text = message_text(data)
+            match = regex.search(text)
+            if match is None:
+                continue
+            matches.append({
+                'session': session_id,
+                'timestamp': ts,
+                'role': data.get('message', {}).get('role', ''),
+                'snippet': snippet(text, match)
+            })
+    finally:
+        if f is not None:
+            f.close()
+
+    return {
+        'query': query,
+        'indexed_messages': indexed,
+        'newly_indexed': added,
+        'candidates': len(messages),
+        'matches': matches
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regex search across sessions")
+    parser.add_argument("--query", required=True, help="Regular expression to search for")
+    parser.add_argument("-i", "--ignore-case", action='store_true', help="Case-insensitive match")
+    parser.add_argument("-F", "--fixed", action='store_true',
+                       help="Treat the query as a literal string")
+    parser.add_argument("--session", help="Only search sessions whose ID starts with this")
+    parser.add_argument("--from", dest='from_date', help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest='to_date', help="End date (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum matches to return")
+    parser.add_argument("--rebuild", action='store_true',
+                       help="Rebuild the index from scratch")
+    parser.add_argument("--format", choices=['json', 'markdown'], default='json')
+
+    args = parser.parse_args()
+
+    result = search_sessions(args.query, args.ignore_case, args.fixed, args.session,
+                             args.from_date, args.to_date, args.limit, args.rebuild)
+
+    if args.format == 'markdown':
+        print(f"# Search: `{args.query}`")
+        print()
+        if 'error' in result:
+            print(f"Error: {result['error']}")
+        else:
+            print(f"{len(result['matches'])} matches "
+                  f"({result['candidates']} candidates of {result['indexed_messages']} messages)")
+            print()
+            for match in result['matches']:
+                print(f"- **{match['session'][:8]}** {match['timestamp']} "
+                      f"({match['role']}): {match['snippet']}")
+    else:
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,92 @@
+"""
+Fixed-memory sketches for approximate summaries.
+"""
+
+import hashlib
+import math
+
+
+def hash64(item):
+    """Stable 64-bit hash of a string."""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """Distinct-count estimator using 2**precision one-byte registers."""
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    @property
+    def relative_error(self):
+        """Standard error of the estimate relative to the true count."""
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, item):
+        x = hash64(item)
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        estimate = self.alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return estimate
+
+
+class CountMinSketch:
+    """Frequency estimator that also tracks its top_k heaviest items.
+
+    Estimates never undercount; with probability 1 - e**-depth they
+    overcount by at most error_bound.
+    """
+
+    def __init__(self, width=1024, depth=4, top_k=10):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0.0] * width for _ in range(depth)]
+        self.total = 0.0
+        self.top_k = top_k
+        self.top = {}
+
+    @property
+    def error_bound(self):
+        return math.e / self.width * self.total
+
+    def _cells(self, item):
+        # Double hashing gives depth independent-enough columns from one hash
+        h = hash64(item)
+        h1, h2 = h & 0xffffffff, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item, count=1):
+        self.total += count
+        estimate = None
+        for row, col in zip(self.rows, self._cells(item)):
+            row[col] += count
+            if estimate is None or row[col] < estimate:
+                estimate = row[col]
+
+        if item in self.top or len(self.top) < self.top_k:
+            self.top[item] = estimate
+        else:
+            smallest = min(self.top, key=self.top.get)
+            if estimate > self.top[smallest]:
+                del self.top[smallest]
+                self.top[item] = estimate
+
+    def estimate(self, item):
+        return min(row[col] for row, col in zip(self.rows, self._cells(item)))
+
+    def most_common(self):
+        """Tracked heavy hitters as (item, estimate), largest first."""
+        return sorted(((item, self.estimate(item)) for item in self.top),
+                      key=lambda x: -x[1])
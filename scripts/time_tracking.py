@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Track active time from message timestamps.
+
+Messages are streamed in order; consecutive messages less than the idle gap
+apart are one block of activity and the time between them counts as active.
+Active time is attributed to days, hours of day and the tools called by the
+message that opened each interval.
+
+Gaps are measured on aware UTC timestamps so DST changes neither reorder
+messages nor add or drop an hour; only the day/hour attribution uses local
+time.
+"""
+
+import json
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+import sys
+
+
+DEFAULT_IDLE_GAP = 30  # minutes
+
+
+def get_sessions_dir():
+    """Get the sessions directory path."""
+    return Path.home() / ".openclaw" / "agents" / "main" / "sessions"
+
+
+def parse_timestamp(ts_str):
+    """Parse ISO timestamp string as a naive local datetime."""
+    return parse_utc_timestamp(ts_str).astimezone().replace(tzinfo=None)
+
+
+def parse_utc_timestamp(ts_str):
+    """Parse ISO timestamp string as an aware UTC datetime.
+
+    Timestamps without an offset are taken as local time.
+    """
+    ts = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+    return ts.astimezone(timezone.utc)
+
+
+def new_time_stats():
+    """Create empty time stats (all durations in seconds)."""
+    return {
+        'active_seconds': 0.0,
+        'blocks': 0,
+        'by_day': {},
+        'by_hour': [0.0] * 24,
+        'by_tool': {}
+    }
+
+
+def add_active_time(stats, start, end, tools=()):
+    """Add the active interval [start, end) of aware datetimes to stats."""
+    seconds = (end - start).total_seconds()
+    stats['active_seconds'] += seconds
+
+    if tools:
+        share = seconds / len(tools)
+        for tool in tools:
+            stats['by_tool'][tool] = stats['by_tool'].get(tool, 0.0) + share
+
+    # Split at local hour boundaries so days and hours of day add up exactly;
+    # stepping in absolute time keeps a repeated or skipped DST hour right
+    while start < end:
+        local = start.astimezone()
+        into_hour = timedelta(minutes=local.minute, seconds=local.second,
+                              microseconds=local.microsecond)
+        segment_end = min(start + timedelta(hours=1) - into_hour, end)
+        seconds = (segment_end - start).total_seconds()
+        day = local.date().isoformat()
+        stats['by_day'][day] = stats['by_day'].get(day, 0.0) + seconds
+        stats['by_hour'][local.hour] += seconds
+        start = segment_end
+
+
+def start_tracking(idle_gap=DEFAULT_IDLE_GAP):
+    """Start tracking one session with an idle gap in minutes."""
+    return {
+        'idle_gap': timedelta(minutes=idle_gap),
+        'last_ts': None,
+        'last_tools': (),
+        'stats': new_time_stats()
+    }
+
+
+def track_message(tracker, ts, tools=()):
+    """Feed the next message timestamp (and its tool calls) to a tracker.
+
+    ts must be an aware datetime, see parse_utc_timestamp().
+    """
+    last_ts = tracker['last_ts']
+    if last_ts is not None and ts < last_ts:
+        # Out-of-order timestamp; time already counted up to last_ts
+        return
+
+    if last_ts is None or ts - last_ts > tracker['idle_gap']:
+        tracker['stats']['blocks'] += 1
+    elif ts > last_ts:
+        add_active_time(tracker['stats'], last_ts, ts, tracker['last_tools'])
+
+    tracker['last_ts'] = ts
+    tracker['last_tools'] = tuple(tools)
+
+
+def finish_tracking(tracker):
+    """Get the time stats of a tracker."""
+    return tracker['stats']
+
+
+def merge_time_stats(total, stats):
+    """Merge stats into total in place and return total."""
+    total['active_seconds'] += stats['active_seconds']
+    total['blocks'] += stats['blocks']
+    for day, seconds in stats['by_day'].items():
+        total['by_day'][day] = total['by_day'].get(day, 0.0) + seconds
+    for hour, seconds in enumerate(stats['by_hour']):
+        total['by_hour'][hour] += seconds
+    for tool, seconds in stats['by_tool'].items():
+        total['by_tool'][tool] = total['by_tool'].get(tool, 0.0) + seconds
+    return total
+
+
+def track_session(jsonl_file, idle_gap=DEFAULT_IDLE_GAP):
+    """Stream a session file and return its time stats."""
+    tracker = start_tracking(idle_gap)
+
+    try:
+        with open(jsonl_file, 'r') as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    if data.get('type') != 'message' or not data.get('timestamp'):
+                        continue
+
+                    tools = []
+                    for item in data.get('message', {}).get('content', []):
+                        if isinstance(item, dict) and item.get('type') == 'toolCall':
+                            tools.append(item.get('name', '').split('.')[0])
+
+                    track_message(tracker, parse_utc_timestamp(data['timestamp']), tools)
+                except (json.JSONDecodeError, ValueError):
+                    continue
+    except Exception as e:
+        print(f"Error reading {jsonl_file}: {e}", file=sys.stderr)
+
+    return finish_tracking(tracker)
+
+
+def track_time(period='week', days=None, idle_gap=DEFAULT_IDLE_GAP, workers=None):
+    """Track active time across sessions, one worker process per CPU."""
+    sessions_dir = get_sessions_dir()
+
+    if not sessions_dir.exists():
+        return {"error": "Sessions directory not found"}
+
+    now = datetime.now()
+    if days:
+        start_date = now - timedelta(days=days)
+    elif period == 'day':
+        start_date = now - timedelta(days=1)
+    elif period == 'month':
+        start_date = now - timedelta(days=30)
+    else:
+        start_date = now - timedelta(weeks=1)
+
+    session_files = []
+    for jsonl_file in sessions_dir.glob("*.jsonl"):
+        if '.deleted.' in jsonl_file.name:
+            continue
+        try:
+            with open(jsonl_file, 'r') as f:
+                data = json.loads(f.readline())
+            if parse_timestamp(data['timestamp']) >= start_date:
+                session_files.append(jsonl_file)
+        except (json.JSONDecodeError, KeyError, ValueError, OSError):
+            continue
+
+    total = new_time_stats()
+    track = partial(track_session, idle_gap=idle_gap)
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(session_files) > 1:
+        chunksize = max(1, len(session_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for stats in pool.map(track, session_files, chunksize=chunksize):
+                merge_time_stats(total, stats)
+    else:
+        for jsonl_file in session_files:
+            merge_time_stats(total, track(jsonl_file))
+
+    def hours(seconds):
+        return round(seconds / 3600, 2)
+
+    return {
+        'period': period if not days else f'{days} days',
+        'sessions': len(session_files),
+        'idle_gap_minutes': idle_gap,
+        'hours_tracked': hours(total['active_seconds']),
+        'blocks': total['blocks'],
+        'by_day': {day: hours(s) for day, s in sorted(total['by_day'].items())},
+        'by_hour': {f"{hour:02d}": hours(s) for hour, s in enumerate(total['by_hour'])},
+        'by_tool': {tool: hours(s) for tool, s in
+                    sorted(total['by_tool'].items(), key=lambda x: -x[1])}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track active time")
+    parser.add_argument("--period", choices=['day', 'week', 'month'], default='week')
+    parser.add_argument("--days", type=int, help="Number of days to analyze")
+    parser.add_argument("--idle-gap", type=float, default=DEFAULT_IDLE_GAP,
+                       help="Minutes without messages that end a block of activity")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=['json', 'markdown'], default='json')
+
+    args = parser.parse_args()
+
+    result = track_time(args.period, args.days, args.idle_gap, args.workers)
+
+    if args.format == 'markdown':
+        print(f"# Time Tracked ({result.get('period', 'Unknown')})")
+        print()
+        if 'error' in result:
+            print(f"Error: {result['error']}")
+        else:
+            print(f"- Time tracked: {result['hours_tracked']} hours")
+            print(f"- Blocks of activity: {result['blocks']}")
+            print(f"- Sessions: {result['sessions']}")
+            print()
+            print("## By Day")
+            for day, h in result['by_day'].items():
+                print(f"- {day}: {h}h")
+            print()
+            if result['by_tool']:
+                print("## By Tool")
+                for tool, h in list(result['by_tool'].items())[:10]:
+                    print(f"- {tool}: {h}h")
+    else:
+        print(json.dumps(result, indent=2))
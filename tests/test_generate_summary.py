@@ -0,0 +1,156 @@
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from generate_summary import (generate_summary, generate_summary_approx,  # noqa: E402
+                              generate_trend, period_start, shift_period)
+
+
+@pytest.fixture
+def sessions_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    path = tmp_path / ".openclaw" / "agents" / "main" / "sessions"
+    path.mkdir(parents=True)
+    return path
+
+
+def write_session(sessions_dir, name, messages):
+    """Write a session of (naive local datetime, role, tool, cost) messages."""
+    with open(sessions_dir / f"{name}.jsonl", 'w') as f:
+        start = messages[0][0].astimezone().isoformat()
+        f.write(json.dumps({'type': 'session', 'timestamp': start}) + '\n')
+        for ts, role, tool, cost in messages:
+            content = [{'type': 'text', 'text': 'x' * 30}]
+            if tool:
+                content.append({'type': 'toolCall', 'name': tool})
+            f.write(json.dumps({
+                'type': 'message',
+                'timestamp': ts.astimezone().isoformat(),
+                'message': {'role': role, 'content': content,
+                            'usage': {'cost': {'total': cost}}}
+            }) + '\n')
+
+
+def test_period_start():
+    assert period_start(datetime(2025, 1, 1, 13, 30), 'day') == datetime(2025, 1, 1)
+    # 2025-01-01 is a Wednesday; its week starts in the previous year
+    assert period_start(datetime(2025, 1, 1, 13, 30), 'week') == datetime(2024, 12, 30)
+    assert period_start(datetime(2025, 3, 31, 23, 59), 'month') == datetime(2025, 3, 1)
+
+
+def test_shift_period_across_boundaries():
+    assert shift_period(datetime(2024, 12, 31), 'day', 1) == datetime(2025, 1, 1)
+    assert shift_period(datetime(2024, 12, 30), 'week', 1) == datetime(2025, 1, 6)
+    assert shift_period(datetime(2025, 1, 6), 'week', -1) == datetime(2024, 12, 30)
+    assert shift_period(datetime(2024, 12, 1), 'month', 1) == datetime(2025, 1, 1)
+    assert shift_period(datetime(2025, 1, 1), 'month', -1) == datetime(2024, 12, 1)
+    assert shift_period(datetime(2025, 3, 1), 'month', -15) == datetime(2023, 12, 1)
+    assert shift_period(datetime(2024, 1, 1), 'month', 23) == datetime(2025, 12, 1)
+
+
+def test_trend_buckets_session_spanning_two_weeks(sessions_dir):
+    current = period_start(datetime.now(), 'week')
+    previous = shift_period(current, 'week', -1)
+    # 20-minute gaps: 30 active minutes last week and 10 this week
+    write_session(sessions_dir, 'spanning', [
+        (current - timedelta(minutes=30), 'user', None, 0.25),
+        (current - timedelta(minutes=10), 'assistant', 'read', 0.5),
+        (current + timedelta(minutes=10), 'assistant', 'exec.run', 1.0),
+    ])
+    write_session(sessions_dir, 'too-old', [
+        (shift_period(current, 'week', -3), 'user', 'write', 2.0),
+    ])
+
+    result = generate_trend('week', last=2)
+    assert result['sessions_scanned'] == 1
+    last_week, this_week = result['trend']
+
+    assert last_week['period_start'] == previous.date().isoformat()
+    assert last_week['sessions'] == 1
+    assert last_week['messages'] == 2
+    assert last_week['user_messages'] == 1
+    assert last_week['cost'] == 0.75
+    assert last_week['time_tracked_hours'] == 0.5
+    assert last_week['tools'] == ['read']
+    assert last_week['delta'] is None
+
+    assert this_week['period_start'] == current.date().isoformat()
+    assert this_week['sessions'] == 1
+    assert this_week['messages'] == 1
+    assert this_week['time_tracked_hours'] == 0.17
+    assert this_week['tools'] == ['exec']
+    assert this_week['delta'] == {
+        'sessions': 0,
+        'messages': -1,
+        'cost': 0.25,
+        'time_tracked_hours': -0.33,
+        'new_tools': ['exec'],
+        'dropped_tools': ['read']
+    }
+
+
+def test_trend_rejects_empty_window(sessions_dir):
+    assert 'error' in generate_trend('week', last=0)
+    assert 'error' in generate_trend('week', last=-3)
+    assert 'error' in generate_trend('year', last=2)
+
+
+def test_approx_without_sampling_is_exact(sessions_dir):
+    start = datetime(2025, 1, 6, 9)
+    for i in range(12):
+        ts = start + timedelta(days=i // 3, hours=i)
+        write_session(sessions_dir, f"s{i}", [
+            (ts + timedelta(minutes=m), role, tool, 0.001 * (i + m))
+            for m, role, tool in [(0, 'user', None), (1, 'assistant', 'exec'),
+                                  (2, 'assistant', 'read' if i % 2 else 'exec'),
+                                  (3, 'user', None)][:i % 4 + 1]
+        ])
+
+    date_args = ('week', 0, '2025-01-01', '2025-02-01')
+    exact = generate_summary(*date_args)
+    approx = generate_summary_approx(*date_args, sample_rate=1, message_rate=1, seed=7)
+
+    assert approx['sessions'] == exact['sessions'] == 12
+    assert approx['sample']['sessions_sampled'] == 12
+    for metric in ('messages', 'user_messages', 'assistant_messages', 'cost'):
+        expected = round(exact[metric], 4)
+        assert approx[metric] == expected
+        assert approx['confidence_intervals'][metric] == [expected, expected]
+    assert approx['tool_calls'] == 15
+    assert approx['top_tools'] == [
+        {'tool': 'exec', 'calls': 12, 'interval': [12, 12]},
+        {'tool': 'read', 'calls': 3, 'interval': [3, 3]}
+    ]
+    assert approx['distinct_tools_in_sample'] == 2
+
+
+def test_approx_rejects_bad_rates(sessions_dir):
+    assert 'error' in generate_summary_approx(sample_rate=0)
+    assert 'error' in generate_summary_approx(sample_rate=2)
+    assert 'error' in generate_summary_approx(message_rate=1.5)
+
+
+@pytest.mark.parametrize('args', [
+    ['--last', '0'],
+    ['--approx', '--sample-rate', '2'],
+    ['--approx', '--message-rate', '0', '--format', 'markdown'],
+])
+def test_cli_exits_non_zero_on_error(sessions_dir, args):
+    result = subprocess.run([sys.executable, str(SCRIPTS / "generate_summary.py")] + args,
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert 'error' in result.stdout.lower()
+
+
+def test_cli_exits_zero_without_error(sessions_dir):
+    for args in [[], ['--approx'], ['--last', '2']]:
+        result = subprocess.run([sys.executable, str(SCRIPTS / "generate_summary.py")] + args,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout
@@ -0,0 +1,159 @@
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import search_sessions  # noqa: E402
+from search_sessions import regex_query, trigrams  # noqa: E402
+
+
+# Letters with non-ASCII case-insensitive equivalents, and those equivalents
+ALPHABET = "abikKsSIx _.ſİıK"
+
+
+def accepts(query, text):
+    """Whether a trigram query admits a text, as the index would."""
+    tris = trigrams(text.lower())
+
+    def evaluate(q):
+        if q[0] == 'all':
+            return True
+        if q[0] == 'tri':
+            return q[1] in tris
+        if q[0] == 'and':
+            return all(evaluate(part) for part in q[1])
+        return any(evaluate(part) for part in q[1])
+
+    return evaluate(query)
+
+
+def random_atom(rng, depth=0):
+    choice = rng.random()
+    if choice < 0.55 or depth > 1:
+        return re.escape(rng.choice(ALPHABET))
+    if choice < 0.65:
+        return rng.choice(['[ab]', '[a-c]', '[sk]', '[^a]', '.', '\\w'])
+    if choice < 0.8:
+        branches = [''.join(random_atom(rng, depth + 1) for _ in range(rng.randint(1, 3)))
+                    for _ in range(rng.randint(2, 3))]
+        return '(' + '|'.join(branches) + ')'
+    inner = ''.join(random_atom(rng, depth + 1) for _ in range(rng.randint(1, 3)))
+    return rng.choice(['(?i:', '(?-i:', '(']) + inner + ')'
+
+
+def random_regex(rng):
+    parts = []
+    for _ in range(rng.randint(2, 6)):
+        atom = random_atom(rng)
+        parts.append(atom + rng.choice(['', '', '', '?', '*', '+', '{2}']))
+    return ''.join(parts)
+
+
+def test_regex_query_admits_every_match():
+    rng = random.Random(1234)
+    matched = 0
+    for _ in range(400):
+        pattern = random_regex(rng)
+        flags = rng.choice([0, re.IGNORECASE])
+        regex = re.compile(pattern, flags)
+        query = regex_query(pattern, flags)
+        for _ in range(50):
+            text = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 14)))
+            if regex.search(text):
+                matched += 1
+                assert accepts(query, text), (pattern, flags, text, query)
+    assert matched > 1000
+
+
+def test_ignore_case_letters_with_unicode_equivalents():
+    for pattern, text in [('sab', 'ſab'), ('iab', 'İab'), ('iab', 'ıab'), ('kab', 'Kab')]:
+        assert re.search(pattern, text, re.IGNORECASE)
+        assert accepts(regex_query(pattern, re.IGNORECASE), text)
+        assert accepts(regex_query(f'(?i){pattern}'), text)
+
+
+def test_literal_query_requires_trigrams():
+    assert regex_query('Traceback') == regex_query('traceback')
+    assert not accepts(regex_query('Traceback'), 'no stack here')
+    assert regex_query('a.c') == ('all',)
+
+
+def write_session(sessions_dir, name, texts, start=0):
+    with open(sessions_dir / f"{name}.jsonl", 'a') as f:
+        if start == 0:
+            f.write(json.dumps({'type': 'session', 'timestamp': '2025-01-01T00:00:00Z'}) + '\n')
+        for i, text in enumerate(texts, start):
+            f.write(json.dumps({
+                'type': 'message',
+                'timestamp': f"2025-01-{i % 28 + 1:02d}T12:00:00Z",
+                'message': {'role': 'user', 'content': [{'type': 'text', 'text': text}]}
+            }) + '\n')
+
+
+def assert_compacted():
+    """One posting batch, holding only ids of live messages."""
+    conn = search_sessions.open_index()
+    try:
+        assert conn.execute('SELECT count(DISTINCT batch) FROM postings').fetchone()[0] == 1
+        live = {row[0] for row in conn.execute('SELECT id FROM messages')}
+        for (blob,) in conn.execute('SELECT ids FROM postings'):
+            assert set(search_sessions.decode_ids(blob)) <= live
+    finally:
+        conn.close()
+
+
+def test_incremental_index_and_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr(search_sessions, 'COMPACT_BATCHES', 3)
+    sessions_dir = tmp_path / ".openclaw" / "agents" / "main" / "sessions"
+    sessions_dir.mkdir(parents=True)
+    write_session(sessions_dir, 'alpha', ['KeyError: user_id', 'all good'])
+    write_session(sessions_dir, 'beta', ['ValueError in parser', 'KeyError: token'])
+
+    result = search_sessions.search_sessions('KeyError: \\w+')
+    assert {m['session'] for m in result['matches']} == {'alpha', 'beta'}
+    assert result['candidates'] == 2
+
+    # No required trigrams: session and dates alone narrow the candidates
+    result = search_sessions.search_sessions('[KV]\\w+', session='be', to_date='2025-01-01')
+    assert result['candidates'] == 1
+    assert [m['snippet'] for m in result['matches']] == ['ValueError in parser']
+
+    # Warm search leaves the index untouched
+    index_file = search_sessions.get_index_file()
+    mtime = index_file.stat().st_mtime_ns
+    assert search_sessions.search_sessions('KeyError')['newly_indexed'] == 0
+    assert index_file.stat().st_mtime_ns == mtime
+
+    # Appended lines are indexed; deleting beta leaves enough dead ids to compact
+    write_session(sessions_dir, 'alpha', ['another KeyError: path'], start=2)
+    (sessions_dir / 'beta.jsonl').rename(sessions_dir / 'beta.deleted.jsonl')
+    result = search_sessions.search_sessions('KeyError', session='al', from_date='2025-01-02')
+    assert [m['snippet'] for m in result['matches']] == ['another KeyError: path']
+    assert_compacted()
+
+    # Every update adds a posting batch until COMPACT_BATCHES merges them
+    write_session(sessions_dir, 'gamma', ['KeyError: late'])
+    assert len(search_sessions.search_sessions('KeyError')['matches']) == 3
+    write_session(sessions_dir, 'delta', ['KeyError: later'])
+    assert len(search_sessions.search_sessions('KeyError')['matches']) == 4
+    assert_compacted()
+
+
+def test_limit_keeps_newest_matches(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    sessions_dir = tmp_path / ".openclaw" / "agents" / "main" / "sessions"
+    sessions_dir.mkdir(parents=True)
+    # Messages on Jan 1-3 in alpha and Jan 2 in beta
+    write_session(sessions_dir, 'alpha', ['KeyError one', 'KeyError two', 'KeyError three'])
+    write_session(sessions_dir, 'beta', ['nothing', 'KeyError four'])
+
+    result = search_sessions.search_sessions('KeyError', limit=1)
+    assert [m['snippet'] for m in result['matches']] == ['KeyError three']
+    result = search_sessions.search_sessions('KeyError', limit=3)
+    assert [m['snippet'] for m in result['matches']][0] == 'KeyError three'
+    assert {m['snippet'] for m in result['matches'][1:]} == {'KeyError two', 'KeyError four'}
+    assert 'error' in search_sessions.search_sessions('KeyError', limit=0)
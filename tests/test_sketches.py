@@ -0,0 +1,47 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from sketches import CountMinSketch, HyperLogLog  # noqa: E402
+
+
+def test_hyperloglog_small_counts_are_exact():
+    hll = HyperLogLog()
+    for _ in range(3):
+        for i in range(20):
+            hll.add(f"tool-{i}")
+    assert round(hll.count()) == 20
+
+
+def test_hyperloglog_within_error():
+    hll = HyperLogLog()
+    for i in range(100000):
+        hll.add(f"item-{i}")
+    assert abs(hll.count() - 100000) / 100000 < 4 * hll.relative_error
+
+
+def test_count_min_never_undercounts():
+    rng = random.Random(0)
+    cms = CountMinSketch(width=64, depth=4, top_k=3)
+    counts = {}
+    for _ in range(5000):
+        item = f"item-{min(int(rng.expovariate(0.3)), 50)}"
+        counts[item] = counts.get(item, 0) + 1
+        cms.add(item)
+
+    assert cms.total == 5000
+    for item, count in counts.items():
+        assert count <= cms.estimate(item) <= count + cms.error_bound
+
+    heaviest = sorted(counts, key=counts.get, reverse=True)[:3]
+    assert [item for item, _ in cms.most_common()] == heaviest
+
+
+def test_count_min_weighted_counts():
+    cms = CountMinSketch()
+    cms.add('exec', 2.5)
+    cms.add('exec', 2.5)
+    cms.add('read', 1)
+    assert cms.most_common() == [('exec', 5.0), ('read', 1.0)]
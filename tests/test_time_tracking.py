@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from time_tracking import finish_tracking, parse_utc_timestamp, start_tracking, track_message  # noqa: E402
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def track(timestamps, idle_gap=30):
+    tracker = start_tracking(idle_gap)
+    for ts in timestamps:
+        track_message(tracker, parse_utc_timestamp(ts), ['exec'])
+    return finish_tracking(tracker)
+
+
+def test_fall_back_keeps_repeated_hour(new_york):
+    # 01:50 EDT, 01:10 EST and 01:40 EST are 20 and 30 minutes apart
+    stats = track(['2025-11-02T05:50:00Z', '2025-11-02T06:10:00Z', '2025-11-02T06:40:00Z'])
+    assert stats['blocks'] == 1
+    assert stats['active_seconds'] == 50 * 60
+    assert stats['by_hour'][1] == 50 * 60
+    assert stats['by_day'] == {'2025-11-02': 50 * 60}
+    assert stats['by_tool'] == {'exec': 50 * 60}
+
+
+def test_spring_forward_skipped_hour_is_not_idle(new_york):
+    # 01:50 EST and 03:10 EDT are 20 minutes apart
+    stats = track(['2025-03-09T06:50:00Z', '2025-03-09T07:10:00Z'])
+    assert stats['blocks'] == 1
+    assert stats['active_seconds'] == 20 * 60
+    assert stats['by_hour'][1] == 10 * 60
+    assert stats['by_hour'][3] == 10 * 60
+
+
+def test_idle_gap_splits_blocks():
+    stats = track(['2025-01-01T10:00:00Z', '2025-01-01T10:10:00Z', '2025-01-01T11:00:00Z'])
+    assert stats['blocks'] == 2
+    assert stats['active_seconds'] == 10 * 60
+    assert sum(stats['by_hour']) == 10 * 60